@@ -1,12 +1,19 @@
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, ttk, messagebox
-from PIL import Image, ImageSequence, ImageTk
+from PIL import Image, ImageChops, ImageSequence, ImageTk
 import os
 from pathlib import Path
 import threading
 import json
 import tempfile
 import itertools
+import hashlib
+import glob
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 
 GIF_FILE_TYPES = [("GIF files", "*.gif")]
 NO_PREVIEW_TEXT = "No preview available"
@@ -16,6 +23,50 @@ TAG_ALL = "all"
 TEXT_BROWSE = "Browse"
 EVENT_ENTER = "<Enter>"
 EVENT_LEAVE = "<Leave>"
+LOSSY_RUN_LENGTH = 8
+LOSSY_MAX = 64
+LOSSY_BISECT_STEPS = 6
+TEMP_FILE_PREFIX = "gifcompress_"
+BATCH_MANIFEST_NAME = ".gif_compressor_manifest.jsonl"
+BATCH_STATUS_OK = "ok"
+BATCH_STATUS_FAILED = "failed"
+BATCH_STATUS_ERROR = "error"
+
+
+def apply_lossy(frame, lossy):
+    """
+    Lossily extend runs of identical palette indices so LZW finds longer matches.
+
+    Each row is split into ceil(width / LOSSY_RUN_LENGTH) near-equal segments
+    by a NEAREST downscale and upscale; they are exactly LOSSY_RUN_LENGTH
+    pixels wide only when the width is a multiple of it. The segment's centre
+    pixel is its anchor, and every pixel whose colour is within `lossy` (per
+    RGB channel) of the anchor takes the anchor's palette index, so no pixel
+    moves further than `lossy` from its quantized colour. Only PIL image
+    operations are used, so this runs at C speed and the result is still
+    written by PIL's own GIF encoder.
+
+    Args:
+        frame: Quantized "P" mode frame.
+        lossy: Maximum per-channel colour error accepted for a substituted pixel.
+
+    Returns:
+        A new "P" mode frame with the same palette.
+    """
+    if not lossy:
+        return frame
+    width, height = frame.size
+    anchors = frame.resize(
+        (max(1, -(-width // LOSSY_RUN_LENGTH)), height), Image.Resampling.NEAREST
+    ).resize((width, height), Image.Resampling.NEAREST)
+
+    red, green, blue = ImageChops.difference(
+        frame.convert("RGB"), anchors.convert("RGB")
+    ).split()
+    mask = ImageChops.lighter(ImageChops.lighter(red, green), blue).point(
+        lambda v: 255 if v <= lossy else 0
+    )
+    return Image.composite(anchors, frame, mask)
 
 
 class GIFCompressorApp:
@@ -30,6 +81,7 @@ class GIFCompressorApp:
         self.root.resizable(True, True)
 
         self.is_compressing = False
+        self.attempt_errors = []
         self.home_dir = str(Path.home())
         self.input_path = tk.StringVar(
             value=str(Path(self.home_dir) / "compressed_output_final.gif")
@@ -200,6 +252,24 @@ class GIFCompressorApp:
         self.progress_label.config(text="Compression cancelled")
         self.log("Compression cancelled by user")
 
+    def set_status(self, text):
+        """Show a short status line above the progress bar."""
+        self.progress_label.config(text=text)
+        self.root.update_idletasks()
+
+    def set_progress(self, value):
+        """Set the progress bar to value (0-100)."""
+        self.progress["value"] = value
+
+    def show_preview(self, frame):
+        """Schedule a preview of frame on the Tk main loop."""
+        self.root.after(0, self.update_preview, frame)
+
+    @staticmethod
+    def confirm(title, message):
+        """Ask the user a yes/no question."""
+        return messagebox.askyesno(title, message)
+
     def log(self, message):
         """Display a message in the log box."""
         if hasattr(self, "status_text"):
@@ -238,46 +308,73 @@ class GIFCompressorApp:
         except Exception as e:
             self.log(f"Error displaying preview: {str(e)}")
 
-    def try_compression_settings(
-        self, frames, skip_frames, colors, resize_ratio, duration, output_path
-    ):
-        """Try compressing with given settings."""
-        if not self.is_compressing:
-            raise InterruptedError("Compression cancelled")
-
-        self.progress_label.config(
-            text=f"Trying: {resize_ratio * 100:.0f}% resize, skip_frames={skip_frames}, {colors} colors"
+    @staticmethod
+    def save_frames(frames, path, duration):
+        """Write quantized frames to path as an optimized animated GIF."""
+        frames[0].save(
+            path,
+            save_all=True,
+            append_images=frames[1:],
+            duration=duration * 1000,
+            loop=0,
+            optimize=True,
+            subrectangles=True,
+            dither=0,
         )
-        self.root.update_idletasks()
+
+    def get_quantized_frames(self, frames, skip_frames, colors, quantize_cache):
+        """Get or create frames with skipping and palette reduction applied."""
+        key = (skip_frames, colors)
+        if key in quantize_cache:
+            return quantize_cache[key]
 
         if skip_frames:
             frames = frames[::2]
             self.log(f"After skipping frames: {len(frames)} frames")
 
-        optimized_frames = []
+        quantized_frames = []
         for frame in frames:
             if frame.mode == "RGBA":
                 frame = frame.convert("RGB")
-            quantized_frame = frame.quantize(colors=colors, method=2)
-            optimized_frames.append(quantized_frame)
+            quantized_frames.append(frame.quantize(colors=colors, method=2))
         self.log(f"Optimized with {colors} colors")
+        quantize_cache[key] = quantized_frames
+        return quantized_frames
+
+    def try_compression_settings(
+        self,
+        frames,
+        skip_frames,
+        colors,
+        resize_ratio,
+        lossy,
+        duration,
+        output_path,
+        quantize_cache,
+    ):
+        """Try compressing with given settings."""
+        if not self.is_compressing:
+            raise InterruptedError("Compression cancelled")
+
+        self.set_status(
+            f"Trying: {resize_ratio * 100:.0f}% resize, skip_frames={skip_frames}, "
+            f"{colors} colors, lossy={lossy}"
+        )
+
+        quantized_frames = self.get_quantized_frames(
+            frames, skip_frames, colors, quantize_cache
+        )
+        optimized_frames = [apply_lossy(frame, lossy) for frame in quantized_frames]
+        if lossy:
+            self.log(f"Applied lossy={lossy}")
 
         # Create a secure temporary file path in the output directory
         temp_dir = os.path.dirname(output_path) or "."
         fd, temp_path = tempfile.mkstemp(
-            prefix="gifcompress_", suffix=".gif", dir=temp_dir
+            prefix=TEMP_FILE_PREFIX, suffix=".gif", dir=temp_dir
         )
         os.close(fd)  # Close the OS handle before PIL writes to the path on Windows
-        optimized_frames[0].save(
-            temp_path,
-            save_all=True,
-            append_images=optimized_frames[1:],
-            duration=duration * 1000,
-            loop=0,
-            optimize=True,
-            subrectangles=True,
-            dither=0,
-        )
+        self.save_frames(optimized_frames, temp_path, duration)
 
         if os.path.exists(temp_path):
             output_size = os.path.getsize(temp_path)
@@ -286,10 +383,13 @@ class GIFCompressorApp:
         raise FileNotFoundError(f"Failed to create temporary GIF: {temp_path}")
 
     def get_cached_frames(self, resize_ratio, original_frames, frame_cache):
-        """Get or create resized frames."""
+        """Get or create resized frames, keeping only the current ratio cached."""
         if resize_ratio in frame_cache:
             return frame_cache[resize_ratio]
 
+        # Ratios are tried once each, so older copies are only a memory cost
+        frame_cache.clear()
+
         if resize_ratio < 1.0:
             frames = [
                 frame.resize(
@@ -314,9 +414,16 @@ class GIFCompressorApp:
         target_size,
         tolerance,
         successful_combinations,
+        quantize_cache,
     ):
-        """Process a single compression setting combination."""
-        skip_frames, colors, resize_ratio = params
+        """
+        Process a single compression setting combination.
+
+        Returns:
+            Tuple of (found_optimal, size); size is None if the attempt failed.
+        """
+        skip_frames, colors, resize_ratio, lossy = params
+        size = None
 
         try:
             size, optimized_frames, temp_path = self.try_compression_settings(
@@ -324,8 +431,10 @@ class GIFCompressorApp:
                 skip_frames,
                 colors,
                 resize_ratio,
+                lossy,
                 duration,
                 output_path,
+                quantize_cache,
             )
 
             if size <= target_size:
@@ -336,12 +445,13 @@ class GIFCompressorApp:
                         resize_ratio,
                         skip_frames,
                         colors,
+                        lossy,
                         temp_path,
                     )
                 )
 
                 if target_size - tolerance <= size:
-                    return True
+                    return True, size
 
             else:
 
@@ -350,8 +460,57 @@ class GIFCompressorApp:
                 except OSError:
                     pass
 
-        except (OSError, ValueError, RuntimeError):
-            pass
+        except (OSError, ValueError, RuntimeError) as e:
+            self.attempt_errors.append(f"{type(e).__name__}: {str(e)}")
+
+        return False, size
+
+    def search_lossy_threshold(
+        self,
+        params,
+        frames,
+        duration,
+        output_path,
+        target_size,
+        tolerance,
+        successful_combinations,
+        quantize_cache,
+    ):
+        """
+        Bisect the lossy threshold for settings whose lossless output is over target.
+
+        Tries LOSSY_MAX first and gives up if even that does not fit, otherwise
+        narrows towards the smallest threshold that still fits.
+        Returns True if a result inside the tolerance band was found.
+        """
+        skip_frames, colors, resize_ratio = params
+        too_big, fits = 0, None
+        lossy = LOSSY_MAX
+
+        for _ in range(LOSSY_BISECT_STEPS):
+            found_optimal, size = self.process_compression_step(
+                (skip_frames, colors, resize_ratio, lossy),
+                frames,
+                duration,
+                output_path,
+                target_size,
+                tolerance,
+                successful_combinations,
+                quantize_cache,
+            )
+            if found_optimal:
+                return True
+
+            if size is not None and size <= target_size:
+                fits = lossy
+            elif fits is None:
+                return False
+            else:
+                too_big = lossy
+
+            lossy = (too_big + fits) // 2
+            if lossy == too_big:
+                break
 
         return False
 
@@ -365,6 +524,7 @@ class GIFCompressorApp:
         target_size = max_size_mb * 1024 * 1024
         tolerance = 0.05 * target_size
         successful_combinations = []
+        self.attempt_errors = []
 
         total_iterations = (
             len(resize_ratios) * len(skip_frames_options) * len(colors_options)
@@ -386,19 +546,35 @@ class GIFCompressorApp:
                     break
 
                 current_iteration += 1
-                self.progress["value"] = (current_iteration / total_iterations) * 100
+                self.set_progress((current_iteration / total_iterations) * 100)
 
+                # Quantize once per setting; lossy attempts reuse the frames
+                quantize_cache = {}
                 params = (skip_frames, colors, resize_ratio)
-                found_optimal = self.process_compression_step(
-                    params,
+                found_optimal, size = self.process_compression_step(
+                    params + (0,),
                     frames,
                     duration,
                     output_path,
                     target_size,
                     tolerance,
                     successful_combinations,
+                    quantize_cache,
                 )
 
+                # Only spend lossy attempts where lossless misses the target
+                if not found_optimal and size is not None and size > target_size:
+                    found_optimal = self.search_lossy_threshold(
+                        params,
+                        frames,
+                        duration,
+                        output_path,
+                        target_size,
+                        tolerance,
+                        successful_combinations,
+                        quantize_cache,
+                    )
+
                 if found_optimal:
                     return successful_combinations
 
@@ -423,7 +599,7 @@ class GIFCompressorApp:
 
         try:
             file_size_mb = os.path.getsize(input_path) / (1024 * 1024)
-            if file_size_mb > 100 and not messagebox.askyesno(
+            if file_size_mb > 100 and not self.confirm(
                 "Large File Warning",
                 f"Input GIF is {file_size_mb:.1f}MB. Compression may be slow or fail. Continue?",
             ):
@@ -444,7 +620,7 @@ class GIFCompressorApp:
                 if gif.n_frames < 1:
                     self.log("Error: Input GIF contains no frames")
                     return False
-                if gif.n_frames > 1000 and not messagebox.askyesno(
+                if gif.n_frames > 1000 and not self.confirm(
                     "High Frame Count Warning",
                     f"Input GIF has {gif.n_frames} frames. Compression may be slow. Continue?",
                 ):
@@ -485,7 +661,7 @@ class GIFCompressorApp:
             return
         for item in combinations:
             try:
-                temp_path = item[5]
+                temp_path = item[6]
                 if os.path.exists(temp_path):
                     os.remove(temp_path)
             except OSError:
@@ -503,27 +679,29 @@ class GIFCompressorApp:
         2. Highest resolution (largest resize_ratio)
         3. No frame skipping (False > True)
         4. More colors (higher palette size preserves quality better)
+        5. Lower lossy threshold (fewer substituted pixels)
 
         Args:
-            combination: Tuple of (size, frames, resize_ratio, skip_frames, colors, temp_path)
+            combination: Tuple of (size, frames, resize_ratio, skip_frames, colors, lossy, temp_path)
 
         Returns:
             Tuple of scoring criteria in descending order of importance.
             Higher values are preferred.
         """
-        size, _, resize_ratio, skip_frames, colors, _ = combination
+        size, _, resize_ratio, skip_frames, colors, lossy, _ = combination
         return (
             size,  # Maximize size (but already ≤ target)
             resize_ratio,  # Prefer higher resolution
             not skip_frames,  # Prefer keeping all frames (True if not skipped)
             colors,  # Prefer richer palette
+            -lossy,  # Prefer fewer substituted pixels
         )
 
     def save_best_result(self, successful_combinations, output_path, duration):
-        """Save the best compression result."""
+        """Save the best compression result and return its combination."""
         if not successful_combinations:
             self.log("No valid compressed versions met the size requirement.")
-            return
+            return None
 
         # Find the combination with the highest score according to our criteria
         best_combination = max(
@@ -536,11 +714,12 @@ class GIFCompressorApp:
             best_resize_ratio,
             best_skip_frames,
             best_colors,
+            best_lossy,
             temp_path,
         ) = best_combination
         self.log(
             f"Saving final GIF with settings: resize_ratio={best_resize_ratio * 100:.1f}%, "
-            f"skip_frames={best_skip_frames}, colors={best_colors}"
+            f"skip_frames={best_skip_frames}, colors={best_colors}, lossy={best_lossy}"
         )
 
         try:
@@ -552,23 +731,15 @@ class GIFCompressorApp:
             os.rename(temp_path, output_path)
         except OSError as e:
             self.log(f"Could not rename temp file: {e}. Falling back to direct save.")
-            best_frames[0].save(
-                output_path,
-                save_all=True,
-                append_images=best_frames[1:],
-                duration=duration * 1000,
-                loop=0,
-                optimize=True,
-                subrectangles=True,
-                dither=0,
-            )
+            self.save_frames(best_frames, output_path, duration)
 
         self.cleanup_temp_files(successful_combinations)
 
         final_size = os.path.getsize(output_path)
         self.log(f"Success! Output GIF size: {final_size / (1024 * 1024):.2f}MB")
 
-        self.root.after(0, self.update_preview, best_frames[0])
+        self.show_preview(best_frames[0])
+        return best_combination
 
     def compress_gif(self):
         """Compress the input GIF to meet the target size."""
@@ -647,22 +818,428 @@ class GIFCompressorApp:
             self.progress_label.config(text="Ready")
 
 
+class HeadlessGIFCompressor(GIFCompressorApp):
+    """Runs the compression search for a single file without the Tk GUI."""
+
+    def __init__(self):
+        """Initialize state without creating any widgets."""
+        self.is_compressing = True
+        self.attempt_errors = []
+        self.messages = []
+
+    def set_status(self, text):
+        """Ignore status updates; there is no progress label."""
+
+    def set_progress(self, value):
+        """Ignore progress updates; there is no progress bar."""
+
+    def show_preview(self, frame):
+        """Ignore previews; there is no canvas."""
+
+    @staticmethod
+    def confirm(title, message):
+        """Always continue; batch runs cannot prompt."""
+        return True
+
+    def log(self, message):
+        """Collect messages so the batch can report the last one on failure."""
+        self.messages.append(message)
+
+    def compress(self, input_path, output_path, max_size_mb):
+        """
+        Compress input_path into output_path and return the best combination.
+
+        Returns None when the file cannot be compressed to the target (not an
+        animated GIF, or no setting fits). Raises when something went wrong
+        along the way, including attempts that failed with an error, so the
+        batch can retry the file on the next run.
+        """
+        if not self.validate_input_file(input_path):
+            return None
+        if not self.validate_gif_content(input_path):
+            return None
+
+        successful_combinations = []
+        try:
+            with Image.open(input_path) as gif:
+                original_frames = [
+                    frame.copy() for frame in ImageSequence.Iterator(gif)
+                ]
+                duration = gif.info.get("duration", 100) / 1000.0
+
+            successful_combinations = self.find_best_compression_combination(
+                original_frames, duration, max_size_mb, output_path
+            )
+            if not successful_combinations and self.attempt_errors:
+                raise RuntimeError(
+                    f"{len(self.attempt_errors)} attempts failed, last: "
+                    f"{self.attempt_errors[-1]}"
+                )
+            return self.save_best_result(successful_combinations, output_path, duration)
+        except Exception as e:
+            self.log(f"Error processing GIF: {str(e)}")
+            self.cleanup_temp_files(successful_combinations)
+            raise
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compress_batch_file(task):
+    """
+    Worker entry point: compress one file and return its manifest record.
+
+    The task is (input_path, output_path, max_size_mb, previous), where
+    previous is the file's manifest entry when run_batch found it up to date
+    by size and settings but with a different mtime (see is_unchanged), and
+    None otherwise. If previous is given and its input_hash matches the
+    file's current hash, the file is not recompressed: the previous result
+    is kept and the record is marked as skipped.
+    """
+    input_path, output_path, max_size_mb, previous = task
+    stat = os.stat(input_path)
+    input_hash = hash_file(input_path)
+    record = {
+        "input_hash": input_hash,
+        "mtime": stat.st_mtime,
+        "size": stat.st_size,
+        "settings": {KEY_MAX_SIZE_MB: max_size_mb},
+    }
+
+    if previous and previous["input_hash"] == input_hash:
+        record["result"] = previous["result"]
+        record["skipped"] = True
+        return record
+
+    compressor = HeadlessGIFCompressor()
+    try:
+        best = compressor.compress(input_path, output_path, max_size_mb)
+    except Exception as e:
+        record["result"] = {"status": BATCH_STATUS_ERROR, "message": str(e)}
+        return record
+
+    if best is None:
+        record["result"] = {
+            "status": BATCH_STATUS_FAILED,
+            "message": compressor.messages[-1] if compressor.messages else "",
+        }
+    else:
+        size, _, resize_ratio, skip_frames, colors, lossy, _ = best
+        record["result"] = {
+            "status": BATCH_STATUS_OK,
+            "output": output_path,
+            "output_size": size,
+            "resize_ratio": resize_ratio,
+            "skip_frames": skip_frames,
+            "colors": colors,
+            "lossy": lossy,
+        }
+    return record
+
+
+batch_started_queue = None
+
+
+def init_batch_worker(started_queue):
+    """Pool initializer: keep the queue used to announce which file starts."""
+    global batch_started_queue
+    batch_started_queue = started_queue
+
+
+def run_batch_task(task):
+    """Announce the task's input path, then compress it."""
+    batch_started_queue.put(task[0])
+    return compress_batch_file(task)
+
+
+def batch_error_record(settings, message):
+    """Build a manifest record for a file that hit an error."""
+    return {
+        "settings": settings,
+        "result": {"status": BATCH_STATUS_ERROR, "message": message},
+    }
+
+
+def run_batch_pool(tasks, workers, settings, handle_record):
+    """
+    Run (size, task) pairs on a process pool, handing each result to handle_record.
+
+    If a worker process dies, the pool breaks and every unfinished task fails
+    with it. Those tasks are returned as (started, not_started) so the caller
+    can retry them: started ones were in flight when the pool broke, and one
+    of them is the file that crashed the worker.
+    """
+    started_queue = multiprocessing.SimpleQueue()
+    unfinished = {task[0]: (size, task) for size, task in tasks}
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_batch_worker,
+        initargs=(started_queue,),
+    ) as executor:
+        futures = {
+            executor.submit(run_batch_task, task): (size, task) for size, task in tasks
+        }
+        for future in as_completed(futures):
+            size, task = futures[future]
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                continue
+            except Exception as e:
+                record = batch_error_record(settings, str(e))
+            del unfinished[task[0]]
+            handle_record(size, task[0], record)
+
+    started_paths = set()
+    while not started_queue.empty():
+        started_paths.add(started_queue.get())
+    started, not_started = [], []
+    for path, item in unfinished.items():
+        (started if path in started_paths else not_started).append(item)
+    if unfinished and not started:
+        # The pool died before any file was announced; isolate them all
+        started, not_started = not_started, []
+    return started, not_started
+
+
+def collect_batch_inputs(source, output_dir):
+    """
+    Return (base_dir, gif_paths) for a directory or a glob pattern.
+
+    Anything inside output_dir and leftover gifcompress_* temp files are
+    skipped, so an output directory nested in the source is never re-read.
+    """
+    output_dir = os.path.abspath(output_dir)
+
+    def is_input(path):
+        path = os.path.abspath(path)
+        return (
+            os.path.isfile(path)
+            and not os.path.basename(path).startswith(TEMP_FILE_PREFIX)
+            and os.path.commonpath([path, output_dir]) != output_dir
+        )
+
+    if os.path.isdir(source):
+        paths = sorted(
+            str(p)
+            for p in Path(source).rglob("*")
+            if p.suffix.lower() == ".gif" and is_input(p)
+        )
+        return source, paths
+
+    paths = sorted(p for p in glob.glob(source, recursive=True) if is_input(p))
+    if not paths:
+        return None, []
+    base_dir = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    return base_dir, paths
+
+
+def output_contains_source(source, output_dir):
+    """Check whether output_dir is the source directory or one of its parents."""
+    source_dir = source
+    if not os.path.isdir(source):
+        # Use the glob's leading directories up to the first wildcard component
+        parts = []
+        for part in Path(source).parts:
+            if any(char in part for char in "*?["):
+                break
+            parts.append(part)
+        source_dir = os.path.join(*parts) if parts else "."
+    output_dir = os.path.abspath(output_dir)
+    return os.path.commonpath([os.path.abspath(source_dir), output_dir]) == output_dir
+
+
+def load_manifest(manifest_path):
+    """Load manifest records keyed by input path; later lines win."""
+    manifest = {}
+    if not os.path.exists(manifest_path):
+        return manifest
+    with open(manifest_path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                manifest[entry["input"]] = entry
+            except (ValueError, KeyError):
+                continue
+    return manifest
+
+
+def is_unchanged(entry, stat, settings):
+    """Check whether a manifest entry still describes an up-to-date result."""
+    if not entry or entry.get("settings") != settings:
+        return False
+    result = entry.get("result", {})
+    if result.get("status") == BATCH_STATUS_OK and not os.path.exists(
+        result.get("output", "")
+    ):
+        return False
+    return result.get("status") in (BATCH_STATUS_OK, BATCH_STATUS_FAILED) and (
+        entry.get("size") == stat.st_size
+    )
+
+
+def run_batch(source, output_dir, max_size_mb, workers=None, log=print):
+    """
+    Compress every GIF under source (a directory or glob) into output_dir.
+
+    Files are scheduled largest first across a process pool so small files
+    fill in the tail. Each finished file is appended to a JSON Lines manifest
+    in output_dir; on reruns, files whose size and mtime are unchanged are
+    skipped outright, and files whose mtime changed are hashed by the worker
+    and skipped if their content is identical. Records for inputs that no
+    longer exist are dropped when the manifest is compacted at the end.
+
+    If a worker process dies (e.g. out of memory on a huge GIF), the files
+    that were in flight are rerun one at a time and the rest go to a fresh
+    pool, so only the file that crashed is recorded as an error.
+
+    Returns:
+        Dict of counts and throughput for the run.
+    """
+    if output_contains_source(source, output_dir):
+        log("Error: Output directory may not be the source directory or contain it")
+        return None
+
+    base_dir, input_paths = collect_batch_inputs(source, output_dir)
+    if not input_paths:
+        log(f"Error: No GIF files found for {source}")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, BATCH_MANIFEST_NAME)
+    manifest = load_manifest(manifest_path)
+    settings = {KEY_MAX_SIZE_MB: max_size_mb}
+
+    tasks = []
+    skipped = 0
+    for input_path in input_paths:
+        key = os.path.abspath(input_path)
+        stat = os.stat(input_path)
+        entry = manifest.get(key)
+        if not is_unchanged(entry, stat, settings):
+            entry = None
+        elif entry.get("mtime") == stat.st_mtime:
+            skipped += 1
+            continue
+
+        output_path = os.path.join(output_dir, os.path.relpath(key, base_dir))
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        tasks.append((stat.st_size, (key, output_path, max_size_mb, entry)))
+
+    # Largest files first so the long-running ones do not end up in the tail
+    tasks.sort(key=lambda task: task[0], reverse=True)
+    log(f"Found {len(input_paths)} GIFs: {skipped} unchanged, {len(tasks)} to check")
+
+    stats = {
+        "compressed": 0,
+        "skipped": skipped,
+        "failed": 0,
+        "errors": 0,
+        "bytes": 0,
+    }
+    start_time = time.perf_counter()
+    with open(manifest_path, "a") as manifest_file:
+
+        def handle_record(size, input_path, record):
+            record["input"] = input_path
+            if record.pop("skipped", False):
+                stats["skipped"] += 1
+            elif record["result"]["status"] == BATCH_STATUS_OK:
+                stats["compressed"] += 1
+                stats["bytes"] += size
+            elif record["result"]["status"] == BATCH_STATUS_FAILED:
+                stats["failed"] += 1
+            else:
+                stats["errors"] += 1
+            log(f"{record['result']['status']}: {input_path}")
+
+            manifest[input_path] = record
+            manifest_file.write(json.dumps(record) + "\n")
+            manifest_file.flush()
+
+        pending = tasks
+        while pending:
+            started, pending = run_batch_pool(pending, workers, settings, handle_record)
+            # Rerun the files that were in flight one at a time, so only the
+            # file that actually kills its worker is recorded as an error
+            for size, task in started:
+                crashed, _ = run_batch_pool([(size, task)], 1, settings, handle_record)
+                if crashed:
+                    handle_record(
+                        size, task[0], batch_error_record(settings, "Worker crashed")
+                    )
+
+    elapsed = time.perf_counter() - start_time
+    stats["seconds"] = elapsed
+    # Throughput only counts files that were actually compressed this run
+    stats["files_per_second"] = stats["compressed"] / elapsed if elapsed else 0.0
+    stats["mb_per_second"] = (
+        stats["bytes"] / (1024 * 1024) / elapsed if elapsed else 0.0
+    )
+
+    # Rewrite the manifest with one line per existing input so it does not grow forever
+    fd, temp_path = tempfile.mkstemp(prefix="manifest_", suffix=".jsonl", dir=output_dir)
+    with os.fdopen(fd, "w") as f:
+        for input_path, record in manifest.items():
+            if os.path.exists(input_path):
+                f.write(json.dumps(record) + "\n")
+    os.replace(temp_path, manifest_path)
+
+    log(
+        f"Compressed {stats['compressed']} files ({stats['skipped']} skipped, "
+        f"{stats['failed']} failed, {stats['errors']} errors) in {elapsed:.1f}s: "
+        f"{stats['files_per_second']:.2f} files/s, {stats['mb_per_second']:.2f} MB/s"
+    )
+    return stats
+
+
+def run_batch_cli(argv):
+    """Parse batch command-line arguments and run the batch."""
+    parser = argparse.ArgumentParser(
+        prog="GIFCompressor.py --batch",
+        description="Compress a directory or glob of GIFs to a target size.",
+    )
+    parser.add_argument("source", help="Input directory or glob pattern")
+    parser.add_argument("output_dir", help="Directory for compressed GIFs")
+    parser.add_argument(
+        "--max-size", type=float, default=4, help="Target size in MB (0.1 to 100)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    args = parser.parse_args(argv)
+
+    if not 0.1 <= args.max_size <= 100:
+        parser.error(MAX_SIZE_ERROR)
+    stats = run_batch(args.source, args.output_dir, args.max_size, args.workers)
+    return 0 if stats and not (stats["failed"] or stats["errors"]) else 1
+
+
 def _test_scoring_logic():
     """Test that score_combination selects the expected best combination."""
-    # Sample successful combinations: (size_bytes, frames, resize_ratio, skip_frames, colors, temp_path)
+    # Sample successful combinations: (size_bytes, frames, resize_ratio, skip_frames, colors, lossy, temp_path)
     combos = [
-        (3_800_000, None, 0.8, True, 128, "a.gif"),  # smaller size, skipped frames
-        (3_900_000, None, 0.8, False, 128, "b.gif"),  # larger size, no skip
-        (3_850_000, None, 0.9, True, 256, "c.gif"),  # higher res, but skipped
-        (3_870_000, None, 0.8, False, 256, "d.gif"),  # good size, no skip, max colors
+        (3_800_000, None, 0.8, True, 128, 0, "a.gif"),  # smaller size, skipped frames
+        (3_900_000, None, 0.8, False, 128, 0, "b.gif"),  # larger size, no skip
+        (3_850_000, None, 0.9, True, 256, 0, "c.gif"),  # higher res, but skipped
+        (3_870_000, None, 0.8, False, 256, 0, "d.gif"),  # good size, no skip, max colors
         (
             3_950_000,
             None,
             0.9,
             False,
             256,
+            0,
             "e.gif",
         ),  # the largest size, highest res, no skip, max colors
+        (3_950_000, None, 0.9, False, 256, 40, "f.gif"),  # same, but lossy
     ]
 
     best = max(combos, key=GIFCompressorApp.score_combination)
@@ -673,11 +1250,156 @@ def _test_scoring_logic():
     print("✓ Scoring logic test passed: best combination selected correctly.")
 
 
+def _test_lossy_prepass():
+    """Test that apply_lossy shrinks the GIF and stays within the threshold."""
+    frames = []
+    for shift in range(3):
+        frame = Image.new("RGB", (320, 240))
+        frame.putdata(
+            [
+                ((x // 2 + shift * 8) % 256, (y + x * y % 13) % 256, (x + y) // 3)
+                for y in range(240)
+                for x in range(320)
+            ]
+        )
+        frames.append(frame.quantize(colors=64, method=2))
+
+    fd, path = tempfile.mkstemp(suffix=".gif")
+    os.close(fd)
+    sizes = {}
+    try:
+        for lossy in (0, 40):
+            lossy_frames = [apply_lossy(frame, lossy) for frame in frames]
+            GIFCompressorApp.save_frames(lossy_frames, path, 0.1)
+            sizes[lossy] = os.path.getsize(path)
+            with Image.open(path) as gif:
+                decoded = [f.convert("RGB") for f in ImageSequence.Iterator(gif)]
+            assert len(decoded) == len(frames), "Lossy pre-pass dropped frames"
+            for original, result in zip(frames, decoded):
+                expected, actual = original.convert("RGB").tobytes(), result.tobytes()
+                error = max(abs(a - b) for a, b in zip(expected, actual))
+                assert error <= lossy, f"Pixel error exceeds lossy={lossy}"
+    finally:
+        os.remove(path)
+
+    assert sizes[40] < sizes[0], "Lossy frames did not reduce the GIF size"
+    print("✓ Lossy pre-pass test passed: frames decode within the error threshold.")
+
+
+def _test_batch_manifest():
+    """Test that a batch rerun skips unchanged files and redoes changed ones."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        input_dir = os.path.join(work_dir, "in")
+        output_dir = os.path.join(work_dir, "out")
+        os.makedirs(os.path.join(input_dir, "sub"))
+        names = ["a.gif", os.path.join("sub", "b.gif")]
+        for i, name in enumerate(names):
+            frames = [
+                Image.new("RGB", (32, 32), (i * 100, shift * 60, 0))
+                for shift in range(3)
+            ]
+            frames[0].save(
+                os.path.join(input_dir, name), save_all=True, append_images=frames[1:]
+            )
+
+        quiet = lambda message: None
+        first = run_batch(input_dir, output_dir, 0.1, workers=2, log=quiet)
+        assert first["compressed"] == 2, "Batch did not process every file"
+        for name in names:
+            assert os.path.exists(os.path.join(output_dir, name)), "Output missing"
+
+        second = run_batch(input_dir, output_dir, 0.1, workers=2, log=quiet)
+        assert (second["compressed"], second["skipped"]) == (0, 2), "Rerun redid work"
+
+        os.utime(os.path.join(input_dir, "a.gif"))
+        third = run_batch(input_dir, output_dir, 0.1, workers=2, log=quiet)
+        assert (third["compressed"], third["skipped"]) == (0, 2), "Touch forced a redo"
+
+        with open(os.path.join(input_dir, "a.gif"), "ab") as f:
+            f.write(b"\0")
+        fourth = run_batch(input_dir, output_dir, 0.1, workers=2, log=quiet)
+        assert (fourth["compressed"], fourth["skipped"]) == (1, 1), "Edit was missed"
+
+        os.rename(
+            os.path.join(input_dir, "sub", "b.gif"),
+            os.path.join(input_dir, "sub", "B.GIF"),
+        )
+        fifth = run_batch(input_dir, output_dir, 0.1, workers=2, log=quiet)
+        assert (fifth["compressed"], fifth["skipped"]) == (1, 1), "Missed .GIF input"
+
+        with open(os.path.join(output_dir, BATCH_MANIFEST_NAME)) as f:
+            inputs = sorted(os.path.basename(json.loads(line)["input"]) for line in f)
+        assert inputs == ["B.GIF", "a.gif"], "Manifest kept entries for deleted inputs"
+
+        class FullDiskCompressor(HeadlessGIFCompressor):
+            def try_compression_settings(self, *args):
+                raise OSError("No space left on device")
+
+        try:
+            FullDiskCompressor().compress(
+                os.path.join(input_dir, "a.gif"), os.path.join(output_dir, "a.gif"), 0.1
+            )
+            raise AssertionError("Attempt errors were reported as a normal failure")
+        except RuntimeError:
+            pass
+        error_entry = {
+            "settings": {KEY_MAX_SIZE_MB: 0.1},
+            "size": os.path.getsize(os.path.join(input_dir, "a.gif")),
+            "result": {"status": BATCH_STATUS_ERROR},
+        }
+        assert not is_unchanged(
+            error_entry, os.stat(os.path.join(input_dir, "a.gif")), error_entry["settings"]
+        ), "Errored files must be retried"
+
+        for bad_output in (input_dir, work_dir):
+            messages = []
+            assert run_batch(input_dir, bad_output, 0.1, log=messages.append) is None
+            assert "may not be the source" in messages[-1], "Overlap was not reported"
+        assert output_contains_source(os.path.join(input_dir, "*.gif"), input_dir)
+
+        if multiprocessing.get_start_method() == "fork":
+            # Forked workers inherit this patch, so a.gif kills its worker
+            def crash_on_a(task):
+                if os.path.basename(task[0]) == "a.gif":
+                    os._exit(1)
+                return original(task)
+
+            original = globals()["compress_batch_file"]
+            globals()["compress_batch_file"] = crash_on_a
+            try:
+                crash_dir = os.path.join(work_dir, "crash")
+                crashed = run_batch(input_dir, crash_dir, 0.1, workers=2, log=quiet)
+            finally:
+                globals()["compress_batch_file"] = original
+            assert (crashed["compressed"], crashed["errors"]) == (1, 1), "Bad counts"
+            manifest = load_manifest(os.path.join(crash_dir, BATCH_MANIFEST_NAME))
+            statuses = {
+                os.path.basename(path): entry["result"]["status"]
+                for path, entry in manifest.items()
+            }
+            assert statuses == {
+                "a.gif": BATCH_STATUS_ERROR,
+                "B.GIF": BATCH_STATUS_OK,
+            }, "A crashed worker took down other files"
+
+        nested_dir = os.path.join(input_dir, "out")
+        for _ in range(2):
+            nested = run_batch(input_dir, nested_dir, 0.1, workers=2, log=quiet)
+        assert nested["compressed"] == 0, "Nested output dir was read as input"
+        assert not os.path.exists(os.path.join(nested_dir, "out")), "Outputs recursed"
+
+    print("✓ Batch manifest test passed: unchanged files are skipped on rerun.")
+
+
 if __name__ == "__main__":
     import sys
 
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         _test_scoring_logic()
+        _test_lossy_prepass()
+        _test_batch_manifest()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        sys.exit(run_batch_cli(sys.argv[2:]))
     else:
         root = tk.Tk()
         app = GIFCompressorApp(root)